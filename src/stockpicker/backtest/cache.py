@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import hashlib, json, os, tempfile, time
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from stockpicker.backtest.engine import BacktestConfig, run_monthly_backtest
+from stockpicker.backtest.metrics import perf_stats_from_equity
+from stockpicker.models.scoring import ScoringContext
+
+
+# Bump to invalidate every stored result after a change to the cache layout itself.
+CACHE_FORMAT = 1
+
+# A .tmp file older than this is left over from a crashed write, not one in progress.
+_STALE_TMP_S = 3600.0
+
+# Modules whose source decides what a backtest returns; editing any of them changes the key.
+_RESULT_MODULES = [
+    "backtest/engine.py",
+    "backtest/metrics.py",
+    "features/factors.py",
+    "features/technical.py",
+    "models/scoring.py",
+    "portfolio/weights.py",
+    "portfolio/trades.py",
+]
+
+
+@lru_cache(maxsize=1)
+def code_version() -> str:
+    """Hash of the source files that affect backtest results."""
+    root = Path(__file__).resolve().parents[1]
+    h = hashlib.blake2b(digest_size=16)
+    h.update(str(CACHE_FORMAT).encode())
+    for rel in _RESULT_MODULES:
+        path = root / rel
+        if path.exists():
+            h.update(rel.encode())
+            h.update(path.read_bytes())
+    return h.hexdigest()
+
+
+def frame_fingerprint(df: Optional[pd.DataFrame | pd.Series], n_blocks: int = 8, block_rows: int = 16) -> str:
+    """Cheap fingerprint: shape, labels, index bounds and checksums of evenly spaced row blocks."""
+    if df is None:
+        return "none"
+    if isinstance(df, pd.Series):
+        df = df.to_frame()
+
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr(df.shape).encode())
+    h.update(pd.util.hash_pandas_object(pd.Index(df.columns.astype(str)), index=False).values.tobytes())
+    if len(df) == 0:
+        return h.hexdigest()
+
+    h.update(repr((df.index[0], df.index[-1])).encode())
+    starts = np.unique(np.linspace(0, max(len(df) - block_rows, 0), num=n_blocks).astype(int))
+    for s in starts:
+        block = df.iloc[s:s + block_rows]
+        h.update(pd.util.hash_pandas_object(block, index=True).values.tobytes())
+    return h.hexdigest()
+
+
+def backtest_cache_key(
+    adj_close: pd.DataFrame,
+    mom_3m: pd.DataFrame,
+    mom_6m: pd.DataFrame,
+    vol_3m: pd.DataFrame,
+    ctx: ScoringContext,
+    cfg: BacktestConfig,
+    initial_capital: float = 1.0,
+) -> str:
+    payload = {
+        "code": code_version(),
+        "cfg": asdict(cfg),
+        "initial_capital": float(initial_capital),
+        "adj_close": frame_fingerprint(adj_close),
+        "mom_3m": frame_fingerprint(mom_3m),
+        "mom_6m": frame_fingerprint(mom_6m),
+        "vol_3m": frame_fingerprint(vol_3m),
+        # the lookup only affects scores when sentiment is switched on
+        "sent_lookup": frame_fingerprint(ctx.sent_lookup) if cfg.lambda_sent != 0.0 else "none",
+        "sectors": sorted(ctx.ticker_to_sector.items()),
+        "spec": asdict(ctx.spec),
+    }
+    blob = json.dumps(payload, sort_keys=True, default=str).encode()
+    return hashlib.blake2b(blob, digest_size=16).hexdigest()
+
+
+def _remove_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+@dataclass
+class BacktestResultCache:
+    """Parquet-backed memo of backtest results, evicted least-recently-used past max_bytes."""
+    cache_dir: str = "bt_cache"
+    max_bytes: int = 256 * 1024 * 1024
+
+    def __post_init__(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path(self, kind: str, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{kind}_{key}.parquet")
+
+    def _read(self, path: str) -> Optional[pd.DataFrame]:
+        if not os.path.exists(path):
+            return None
+        try:
+            df = pd.read_parquet(path)
+            os.utime(path)  # mark as recently used
+        except FileNotFoundError:
+            # evicted by another process in the meantime
+            return None
+        except Exception:
+            # partial write or corrupt file: treat as a miss and let it be rewritten
+            _remove_quietly(path)
+            return None
+        return df
+
+    def _write(self, path: str, df: pd.DataFrame) -> None:
+        # unique temp file per writer, so concurrent writers of one key never share it;
+        # the last os.replace wins, which is fine since they hold the same result
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".parquet.tmp")
+        os.close(fd)
+        try:
+            df.to_parquet(tmp, compression="zstd")
+            os.replace(tmp, path)
+        except BaseException:
+            _remove_quietly(tmp)
+            raise
+        self.evict()
+
+    def evict(self) -> None:
+        """Drop stale temp files, then least-recently-used entries until the cache fits in max_bytes."""
+        now = time.time()
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith((".parquet", ".parquet.tmp")):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            if name.endswith(".tmp") and now - st.st_mtime > _STALE_TMP_S:
+                _remove_quietly(path)
+                continue
+            # in-flight temp files still count toward the size budget
+            entries.append((st.st_mtime, st.st_size, path))
+        total = sum(e[1] for e in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            _remove_quietly(path)
+            total -= size
+
+    def run_monthly_backtest(
+        self,
+        adj_close: pd.DataFrame,
+        mom_3m: pd.DataFrame,
+        mom_6m: pd.DataFrame,
+        vol_3m: pd.DataFrame,
+        ctx: ScoringContext,
+        cfg: BacktestConfig,
+        initial_capital: float = 1.0,
+    ) -> pd.DataFrame:
+        """Memoized run_monthly_backtest; identical inputs return the stored frame."""
+        key = backtest_cache_key(adj_close, mom_3m, mom_6m, vol_3m, ctx, cfg, initial_capital)
+        path = self._path("bt", key)
+        cached = self._read(path)
+        if cached is not None:
+            return cached
+
+        bt = run_monthly_backtest(
+            adj_close=adj_close,
+            mom_3m=mom_3m,
+            mom_6m=mom_6m,
+            vol_3m=vol_3m,
+            ctx=ctx,
+            cfg=cfg,
+            initial_capital=initial_capital,
+        )
+        self._write(path, bt)
+        return bt
+
+    def perf_stats_from_equity(self, equity: pd.Series) -> dict:
+        """Memoized perf_stats_from_equity keyed by the equity curve's values."""
+        eq = pd.Series(equity)
+        h = hashlib.blake2b(digest_size=16)
+        h.update(code_version().encode())
+        h.update(pd.util.hash_pandas_object(eq, index=True).values.tobytes())
+        path = self._path("stats", h.hexdigest())
+        cached = self._read(path)
+        if cached is not None:
+            stats = {k: float(v) for k, v in cached.iloc[0].items()}
+            stats["months"] = int(stats["months"])
+            return stats
+
+        stats = perf_stats_from_equity(eq)
+        self._write(path, pd.DataFrame([stats]))
+        return stats
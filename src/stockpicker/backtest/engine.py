@@ -6,8 +6,9 @@ from typing import Dict, Optional, Tuple
 import numpy as np
 import pandas as pd
 
+from stockpicker.features.factors import compute_factors
 from stockpicker.features.technical import build_monthly_dates
-from stockpicker.models.scoring import ScoringContext, score_universe
+from stockpicker.models.scoring import ScoringContext, score_factors
 from stockpicker.portfolio.weights import make_equal_weights, make_inv_vol_weights
 from stockpicker.portfolio.trades import compute_turnover
 
@@ -41,6 +42,12 @@ def run_monthly_backtest(
 ) -> pd.DataFrame:
     dates = build_monthly_dates(adj_close.index, start=cfg.start)
 
+    # factors the scoring spec needs beyond the passed-in panels are only evaluated at rebalance dates
+    panels = {"mom_3m": mom_3m, "mom_6m": mom_6m, "vol_3m": vol_3m}
+    missing = [n for n in ctx.spec.factors if n not in panels]
+    if missing:
+        panels.update(compute_factors(adj_close, missing, dates=dates))
+
     equity_rows = []
     portfolio_value = float(initial_capital)
     prev_weights: Dict[str, float] = {}
@@ -49,11 +56,9 @@ def run_monthly_backtest(
         asof_date = pd.Timestamp(dates.iloc[i])
         next_date = pd.Timestamp(dates.iloc[i + 1])
 
-        picks = score_universe(
+        picks = score_factors(
             asof_date=asof_date,
-            mom_3m=mom_3m,
-            mom_6m=mom_6m,
-            vol_3m=vol_3m,
+            panels=panels,
             ctx=ctx,
             top_n=cfg.top_n,
             lambda_sent=cfg.lambda_sent,
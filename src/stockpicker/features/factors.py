@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# A compute fn gets the shared inputs (adj_close + requested intermediates) and, when
+# evaluating at selected dates only, the integer row positions to evaluate. It returns
+# a full daily DataFrame when pos is None, otherwise an ndarray of shape (len(pos), n_tickers).
+ComputeFn = Callable[[Dict[str, pd.DataFrame], Optional[np.ndarray]], "pd.DataFrame | np.ndarray"]
+
+
+@dataclass(frozen=True)
+class Intermediate:
+    name: str
+    needs: Tuple[str, ...]
+    compute: Callable[[Dict[str, pd.DataFrame]], pd.DataFrame]
+
+
+@dataclass(frozen=True)
+class Factor:
+    name: str
+    lookback: int               # rows of price history needed before the evaluation date
+    needs: Tuple[str, ...]      # shared intermediates, resolved before any factor runs
+    compute: ComputeFn
+
+
+INTERMEDIATES: Dict[str, Intermediate] = {}
+FACTORS: Dict[str, Factor] = {}
+
+
+def register_intermediate(name: str, needs: Iterable[str] = ("adj_close",)):
+    def deco(fn):
+        INTERMEDIATES[name] = Intermediate(name=name, needs=tuple(needs), compute=fn)
+        return fn
+    return deco
+
+
+def register_factor(name: str, lookback: int, needs: Iterable[str] = ()):
+    def deco(fn):
+        FACTORS[name] = Factor(name=name, lookback=int(lookback), needs=tuple(needs), compute=fn)
+        return fn
+    return deco
+
+
+# --- shared intermediates ---------------------------------------------------------------
+
+@register_intermediate("rets")
+def _rets(x: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    # a zero price gives an inf return; as missing it only blanks the windows that contain
+    # it, whereas in the running sums below it would poison every later window
+    return x["adj_close"].pct_change(fill_method=None).replace([np.inf, -np.inf], np.nan)
+
+
+# Running sums over the return panel (NaN counted as 0, with a separate running count), so
+# any trailing-window mean/variance is two row lookups instead of its own rolling pass.
+
+@register_intermediate("rets_count_csum", needs=("rets",))
+def _rets_count_csum(x: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    return x["rets"].notna().cumsum()
+
+
+@register_intermediate("rets_csum", needs=("rets",))
+def _rets_csum(x: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    return x["rets"].fillna(0.0).cumsum()
+
+
+@register_intermediate("rets_sq_csum", needs=("rets",))
+def _rets_sq_csum(x: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    return (x["rets"] ** 2).fillna(0.0).cumsum()
+
+
+@register_intermediate("downside_sq_csum", needs=("rets",))
+def _downside_sq_csum(x: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    return (x["rets"].clip(upper=0.0) ** 2).fillna(0.0).cumsum()
+
+
+# --- helpers that work on the full panel or on selected rows ----------------------------
+
+def _lag_return(px: pd.DataFrame, lag: int, skip: int, pos: Optional[np.ndarray]):
+    """px[t - skip] / px[t - lag] - 1, matching pct_change(lag, fill_method=None) when skip=0."""
+    if pos is None:
+        return px.shift(skip) / px.shift(lag) - 1.0 if skip else px.pct_change(lag, fill_method=None)
+    vals = px.to_numpy(dtype=float)
+    out = np.full((len(pos), vals.shape[1]), np.nan)
+    ok = pos - lag >= 0
+    out[ok] = vals[pos[ok] - skip] / vals[pos[ok] - lag] - 1.0
+    return out
+
+
+def _window_sum(csum: pd.DataFrame, window: int, pos: Optional[np.ndarray]):
+    """Sum over the trailing window ending at each row (or each pos), from a running sum."""
+    vals = csum.to_numpy(dtype=float)
+    padded = np.vstack([np.zeros((1, vals.shape[1])), vals])
+    rows = np.arange(len(vals)) if pos is None else np.asarray(pos)
+    out = np.full((len(rows), vals.shape[1]), np.nan)
+    ok = rows + 1 - window >= 0
+    out[ok] = padded[rows[ok] + 1] - padded[rows[ok] + 1 - window]
+    return out
+
+
+def _as_output(vals: np.ndarray, like: pd.DataFrame, pos: Optional[np.ndarray]):
+    return pd.DataFrame(vals, index=like.index, columns=like.columns) if pos is None else vals
+
+
+def _rolling_mean(x: Dict[str, pd.DataFrame], csum: str, window: int, pos: Optional[np.ndarray]):
+    # a window with any missing return is NaN, like rolling(window) with min_periods=window
+    n = _window_sum(x["rets_count_csum"], window, pos)
+    out = _window_sum(x[csum], window, pos) / window
+    out[n < window] = np.nan
+    return _as_output(out, x["rets"], pos)
+
+
+def _rolling_std(x: Dict[str, pd.DataFrame], window: int, pos: Optional[np.ndarray]):
+    n = _window_sum(x["rets_count_csum"], window, pos)
+    s1 = _window_sum(x["rets_csum"], window, pos)
+    s2 = _window_sum(x["rets_sq_csum"], window, pos)
+    var = np.clip((s2 - s1 * s1 / window) / (window - 1), 0.0, None)
+    out = np.sqrt(var)
+    out[n < window] = np.nan
+    return _as_output(out, x["rets"], pos)
+
+
+# --- factors ----------------------------------------------------------------------------
+
+@register_factor("mom_3m", lookback=63)
+def _f_mom_3m(x, pos):
+    return _lag_return(x["adj_close"], 63, 0, pos)
+
+
+@register_factor("mom_6m", lookback=126)
+def _f_mom_6m(x, pos):
+    return _lag_return(x["adj_close"], 126, 0, pos)
+
+
+@register_factor("mom_12_1", lookback=252)
+def _f_mom_12_1(x, pos):
+    """12-month return skipping the most recent month."""
+    return _lag_return(x["adj_close"], 252, 21, pos)
+
+
+@register_factor("vol_3m", lookback=63, needs=("rets_count_csum", "rets_csum", "rets_sq_csum"))
+def _f_vol_3m(x, pos):
+    return _rolling_std(x, 63, pos)
+
+
+@register_factor("downside_vol_3m", lookback=63, needs=("rets_count_csum", "downside_sq_csum"))
+def _f_downside_vol_3m(x, pos):
+    """3M semideviation: root mean square of negative daily returns."""
+    return np.sqrt(_rolling_mean(x, "downside_sq_csum", 63, pos))
+
+
+# --- engine -----------------------------------------------------------------------------
+
+def _resolve_intermediates(needs: Iterable[str]) -> List[str]:
+    """Dependency-ordered list of the given intermediates and everything they need."""
+    order: List[str] = []
+    seen = {"adj_close"}
+
+    def visit(name: str, stack: Tuple[str, ...]):
+        if name in seen:
+            return
+        if name in stack:
+            raise ValueError(f"cyclic intermediate dependency: {' -> '.join(stack + (name,))}")
+        if name not in INTERMEDIATES:
+            raise ValueError(f"unknown intermediate '{name}'")
+        for dep in INTERMEDIATES[name].needs:
+            visit(dep, stack + (name,))
+        seen.add(name)
+        order.append(name)
+
+    for dep in needs:
+        visit(dep, ())
+    return order
+
+
+def max_lookback(names: Iterable[str]) -> int:
+    return max((FACTORS[n].lookback for n in names), default=0)
+
+
+def compute_factors(
+    adj_close: pd.DataFrame,
+    names: Iterable[str],
+    dates: Optional[Iterable[pd.Timestamp]] = None,
+    keep: Iterable[str] = (),
+) -> dict[str, pd.DataFrame]:
+    """Compute the requested factors in one pass, sharing intermediates between them.
+
+    With dates=None every factor is a full daily panel. Otherwise factors are only
+    evaluated at those dates (each must be in adj_close.index), and intermediates are
+    only built over the history the requested lookbacks actually reach. Intermediates
+    named in keep are returned alongside the factors, as built.
+    """
+    keep = list(keep)
+    names = list(dict.fromkeys(names))
+    unknown = [n for n in names if n not in FACTORS]
+    if unknown:
+        raise ValueError(f"unknown factor(s): {unknown}")
+    factors = [FACTORS[n] for n in names]
+    needs = [dep for f in factors for dep in f.needs] + keep
+
+    pos = None
+    out_index = adj_close.index
+    if dates is not None:
+        out_index = pd.DatetimeIndex(list(dates))
+        pos = adj_close.index.get_indexer(out_index)
+        if (pos < 0).any():
+            raise ValueError("all dates must be present in adj_close.index")
+        start = max(int(pos.min()) - max_lookback(names), 0) if len(pos) else 0
+        adj_close = adj_close.iloc[start:]
+        pos = pos - start
+
+    inputs: Dict[str, pd.DataFrame] = {"adj_close": adj_close}
+    for name in _resolve_intermediates(needs):
+        inputs[name] = INTERMEDIATES[name].compute(inputs)
+
+    out = {name: inputs[name] for name in keep}
+    for f in factors:
+        res = f.compute(inputs, pos)
+        if pos is not None:
+            res = pd.DataFrame(res, index=out_index, columns=adj_close.columns)
+        out[f.name] = res
+    return out
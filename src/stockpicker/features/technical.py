@@ -2,14 +2,12 @@ from __future__ import annotations
 
 import pandas as pd
 
+from stockpicker.features.factors import compute_factors
+
 
 def compute_features(adj_close: pd.DataFrame) -> dict[str, pd.DataFrame]:
     """Compute daily returns, 3M/6M momentum, and 3M rolling volatility."""
-    rets = adj_close.pct_change(fill_method=None)
-    mom_3m = adj_close.pct_change(63, fill_method=None)
-    mom_6m = adj_close.pct_change(126, fill_method=None)
-    vol_3m = rets.rolling(63).std()
-    return {"rets": rets, "mom_3m": mom_3m, "mom_6m": mom_6m, "vol_3m": vol_3m}
+    return compute_factors(adj_close, ["mom_3m", "mom_6m", "vol_3m"], keep=["rets"])
 
 
 def build_monthly_dates(trading_index: pd.DatetimeIndex, start: str) -> pd.Series:
@@ -1,17 +1,45 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 import pandas as pd
 
 from stockpicker.features.technical import zscore, month_end
 
 
+@dataclass(frozen=True)
+class FactorTerm:
+    factor: str                    # name in stockpicker.features.factors.FACTORS
+    weight: float
+    sector_relative: bool = False  # z-score within sector instead of across the universe
+
+
+@dataclass(frozen=True)
+class ScoringSpec:
+    terms: Tuple[FactorTerm, ...]
+
+    def __post_init__(self):
+        if not self.terms:
+            raise ValueError("ScoringSpec needs at least one FactorTerm")
+
+    @property
+    def factors(self) -> List[str]:
+        return [t.factor for t in self.terms]
+
+
+DEFAULT_SPEC = ScoringSpec(terms=(
+    FactorTerm("mom_3m", 0.6, sector_relative=True),
+    FactorTerm("mom_6m", 0.4, sector_relative=True),
+    FactorTerm("vol_3m", -0.3),
+))
+
+
 @dataclass
 class ScoringContext:
     ticker_to_sector: Dict[str, str]
     sent_lookup: Optional[pd.DataFrame] = None  # MultiIndex (month_end, ticker) -> sent_z
+    spec: ScoringSpec = DEFAULT_SPEC
 
 
 def _get_sent_z(sent_lookup: pd.DataFrame | None, ticker: str, asof_date: pd.Timestamp) -> float:
@@ -33,25 +61,44 @@ def score_universe(
     top_n: int = 20,
     lambda_sent: float = 0.0,
 ) -> List[str]:
-    rankable = mom_3m.loc[asof_date].dropna().index.tolist()
+    panels = {"mom_3m": mom_3m, "mom_6m": mom_6m, "vol_3m": vol_3m}
+    return score_factors(asof_date, panels, ctx, top_n=top_n, lambda_sent=lambda_sent)
+
+
+def score_factors(
+    asof_date: pd.Timestamp,
+    panels: Dict[str, pd.DataFrame],
+    ctx: ScoringContext,
+    top_n: int = 20,
+    lambda_sent: float = 0.0,
+) -> List[str]:
+    """Rank tickers on asof_date by ctx.spec, using factor panels keyed by factor name."""
+    names = ctx.spec.factors
+    missing = [n for n in names if n not in panels]
+    if missing:
+        raise ValueError(f"no factor panel for {missing}; compute them with features.factors.compute_factors")
+
+    rankable = panels[names[0]].loc[asof_date].dropna().index.tolist()
     if len(rankable) < top_n:
         return []
 
+    cols = {n: panels[n].loc[asof_date, rankable].values for n in dict.fromkeys(names)}
     df = pd.DataFrame({
         "ticker": rankable,
         "sector": [ctx.ticker_to_sector[t] for t in rankable],
-        "mom_3m": mom_3m.loc[asof_date, rankable].values,
-        "mom_6m": mom_6m.loc[asof_date, rankable].values,
-        "vol_3m": vol_3m.loc[asof_date, rankable].values,
+        **cols,
     }).dropna()
 
     if df.empty or df["ticker"].nunique() < top_n:
         return []
 
-    df["mom3_z_sector"] = df.groupby("sector")["mom_3m"].transform(zscore)
-    df["mom6_z_sector"] = df.groupby("sector")["mom_6m"].transform(zscore)
-    df["vol_z"] = zscore(df["vol_3m"])
-    df["QuantScore"] = 0.6*df["mom3_z_sector"] + 0.4*df["mom6_z_sector"] - 0.3*df["vol_z"]
+    df["QuantScore"] = 0.0
+    for term in ctx.spec.terms:
+        if term.sector_relative:
+            z = df.groupby("sector")[term.factor].transform(zscore)
+        else:
+            z = zscore(df[term.factor])
+        df["QuantScore"] = df["QuantScore"] + term.weight * z
 
     if lambda_sent != 0.0:
         df["sent_z"] = df["ticker"].apply(lambda t: _get_sent_z(ctx.sent_lookup, t, asof_date))
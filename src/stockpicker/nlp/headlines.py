@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import hashlib
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from stockpicker.features.technical import month_end, zscore
+
+
+# Per-headline table written by MonthlySentimentStore next to the monthly parquet.
+# month_end is the month the headline was fetched for, published the parsed RSS timestamp.
+HEADLINE_COLUMNS = ["ticker", "published", "month_end", "headline_hash", "score"]
+
+AGGS = ("mean", "median", "decay", "count_weighted", "last_n")
+
+
+def headline_hash(title: str) -> np.uint64:
+    return np.uint64(int.from_bytes(hashlib.blake2b(title.encode("utf-8"), digest_size=8).digest(), "little"))
+
+
+def parse_published(values: Iterable[str]) -> pd.Series:
+    """Parse RSS 'published' strings to UTC timestamps; unparseable values become NaT."""
+    return pd.to_datetime(pd.Series(list(values), dtype=object), utc=True, errors="coerce", format="mixed")
+
+
+def headline_frame(ticker: str, me: pd.Timestamp, items: List[Dict[str, Any]], scores: np.ndarray) -> pd.DataFrame:
+    """Rows for one ticker-month, items aligned with their FinBERT scores."""
+    return pd.DataFrame({
+        "ticker": ticker,
+        "published": parse_published(h.get("published", "") for h in items),
+        "month_end": pd.Timestamp(me),
+        "headline_hash": np.array([headline_hash(h["title"]) for h in items], dtype=np.uint64),
+        "score": np.asarray(scores, dtype=np.float32),
+    }, columns=HEADLINE_COLUMNS)
+
+
+def sort_headlines(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.sort_values(["ticker", "published"], kind="stable", na_position="first")
+    df["ticker"] = df["ticker"].astype("category")
+    return df.reset_index(drop=True)
+
+
+def load_headlines(parquet_path: str) -> pd.DataFrame:
+    """Load the per-headline table, indexed by (ticker, published)."""
+    df = pd.read_parquet(parquet_path)
+    df["published"] = pd.to_datetime(df["published"], utc=True)
+    df["month_end"] = pd.to_datetime(df["month_end"])
+    return df.set_index(["ticker", "published"]).sort_index()
+
+
+def to_lookup(df: pd.DataFrame) -> pd.DataFrame:
+    """Monthly (month_end, ticker, sentiment_mean, n_headlines) rows -> scoring lookup with sent_z."""
+    df = df.copy()
+    df["month_end"] = pd.to_datetime(df["month_end"])
+    df["ticker"] = df["ticker"].astype(str)
+    df["sent_z"] = df.groupby("month_end")["sentiment_mean"].transform(zscore)
+    return df.set_index(["month_end", "ticker"]).sort_index()
+
+
+def _windowed(h: pd.DataFrame, asof_dates: List[pd.Timestamp], window_days: float) -> pd.DataFrame:
+    """Headlines published in (asof - window_days, asof] for each asof, tagged with asof."""
+    # the same live headline is stored once per month it was fetched under; count it once
+    h = h.dropna(subset=["published"]).drop_duplicates(["ticker", "headline_hash", "published"])
+    h = h.sort_values("published", kind="stable")
+    t = pd.DatetimeIndex(h["published"])
+    win = pd.Timedelta(days=window_days)
+    parts = []
+    for asof in asof_dates:
+        cutoff = pd.Timestamp(asof)
+        cutoff = cutoff.tz_localize("UTC") if cutoff.tzinfo is None else cutoff.tz_convert("UTC")
+        # the whole as-of day counts, nothing after it
+        end = cutoff.normalize() + pd.Timedelta(days=1)
+        lo, hi = t.searchsorted(end - win, side="left"), t.searchsorted(end, side="left")
+        part = h.iloc[lo:hi]
+        parts.append(part.assign(asof=cutoff.normalize(), month_end=month_end(asof)))
+    if not parts:
+        return h.iloc[:0].assign(asof=pd.Series(dtype="datetime64[ns, UTC]"))
+    return pd.concat(parts, ignore_index=True)
+
+
+def aggregate_headlines(
+    headlines: pd.DataFrame,
+    asof_dates: Optional[Iterable[pd.Timestamp]] = None,
+    agg: str = "mean",
+    window_days: Optional[float] = 30.0,
+    half_life_days: float = 7.0,
+    last_n: int = 10,
+    prior_count: float = 5.0,
+    tickers: Optional[Iterable[str]] = None,
+) -> pd.DataFrame:
+    """Re-aggregate stored headline scores into a load_lookup-compatible frame.
+
+    With window_days=None headlines are grouped by the month they were fetched for,
+    which reproduces the original build. Otherwise each as-of date sees only headlines
+    published within window_days up to and including that day.
+
+    agg: mean | median | decay (exponential in age, half_life_days) |
+         count_weighted (sum / (n + prior_count), shrinks thin coverage to 0) |
+         last_n (mean of the last_n most recent headlines)
+
+    Undated headlines (unparseable RSS 'published') only occur in fetch-month mode; the
+    windowed mode drops them. They count toward n_headlines. mean, median and
+    count_weighted use them, last_n ranks them as the oldest, and decay leaves them
+    out of the weighted average because their age is unknown.
+    """
+    if agg not in AGGS:
+        raise ValueError(f"agg must be one of {AGGS}")
+
+    h = headlines.reset_index() if "ticker" not in headlines.columns else headlines.copy()
+    h["ticker"] = h["ticker"].astype(str)
+    all_tickers = sorted(set(tickers) if tickers is not None else set(h["ticker"]))
+
+    if window_days is None:
+        h["asof"] = pd.to_datetime(h["month_end"]).dt.tz_localize("UTC")
+        if asof_dates is not None:
+            keep = {month_end(d) for d in asof_dates}
+            h = h[pd.to_datetime(h["month_end"]).isin(keep)]
+        months = sorted(pd.to_datetime(h["month_end"]).unique())
+    else:
+        if asof_dates is None:
+            raise ValueError("asof_dates is required when window_days is set")
+        asof_dates = [pd.Timestamp(d) for d in asof_dates]
+        h = _windowed(h, asof_dates, window_days)
+        months = sorted({month_end(d) for d in asof_dates})
+
+    keys = ["month_end", "ticker"]
+    score = h["score"].astype(float)
+    if agg == "mean":
+        s = score.groupby([h[k] for k in keys]).mean()
+    elif agg == "median":
+        s = score.groupby([h[k] for k in keys]).median()
+    elif agg == "decay":
+        age = (h["asof"] - h["published"]).dt.total_seconds() / 86400.0
+        w = np.exp2(-age.clip(lower=0.0) / half_life_days)
+        g = pd.DataFrame({"ws": w * score, "w": w, **{k: h[k] for k in keys}}).groupby(keys)
+        s = g["ws"].sum() / g["w"].sum()
+    elif agg == "count_weighted":
+        g = score.groupby([h[k] for k in keys])
+        s = g.sum() / (g.count() + prior_count)
+    else:  # last_n
+        h = h.assign(score=score).sort_values("published", kind="stable", na_position="first")
+        recent = h[h.groupby(keys).cumcount(ascending=False) < last_n]
+        s = recent.groupby(keys)["score"].mean()
+    n = h.groupby(keys).size()
+
+    full = pd.MultiIndex.from_product([pd.DatetimeIndex(months), all_tickers], names=keys)
+    out = pd.DataFrame({
+        "sentiment_mean": s.reindex(full).fillna(0.0).astype(float),
+        "n_headlines": n.reindex(full).fillna(0).astype(int),
+    }).reset_index()
+    return to_lookup(out)
@@ -2,19 +2,27 @@ from __future__ import annotations
 
 import os
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional
 
 import numpy as np
 import pandas as pd
 
-from stockpicker.features.technical import month_end, zscore
-from stockpicker.nlp.finbert import FinBertScorer
+from stockpicker.features.technical import month_end
+from stockpicker.nlp.headlines import HEADLINE_COLUMNS, headline_frame, sort_headlines, to_lookup
 from stockpicker.nlp.news_rss import GoogleNewsRSS
 
+if TYPE_CHECKING:
+    from stockpicker.nlp.finbert import FinBertScorer
+
+
+def _pair_index(df: pd.DataFrame) -> pd.MultiIndex:
+    return pd.MultiIndex.from_arrays([df["ticker"].astype(str), pd.to_datetime(df["month_end"])])
+
 
 @dataclass
 class MonthlySentimentStore:
     parquet_path: str = "sentiment_monthly.parquet"
+    headlines_path: Optional[str] = "sentiment_headlines.parquet"  # per-headline scores, None to skip
     max_items: int = 30
     batch_size: int = 64
     overwrite: bool = False
@@ -25,10 +33,17 @@ class MonthlySentimentStore:
         if self.rss is None:
             self.rss = GoogleNewsRSS()
         if self.finbert is None:
+            # torch/transformers are only needed to score, not to load a built lookup
+            from stockpicker.nlp.finbert import FinBertScorer
             self.finbert = FinBertScorer()
 
     def build_resumable(self, tickers: List[str], monthly_dates: pd.Series) -> pd.DataFrame:
-        """Build/update a monthly sentiment parquet, resumable if the file exists."""
+        """Build/update a monthly sentiment parquet, resumable if the file exists.
+
+        Each scored headline is also kept in headlines_path, so other aggregations
+        can be derived later with nlp.headlines.aggregate_headlines.
+        """
+        keep_headlines = self.headlines_path is not None
         if os.path.exists(self.parquet_path) and not self.overwrite:
             existing = pd.read_parquet(self.parquet_path)
             existing["month_end"] = pd.to_datetime(existing["month_end"])
@@ -40,9 +55,17 @@ class MonthlySentimentStore:
             done = set()
             rows = []
 
+        headline_parts = []
+        if keep_headlines:
+            if os.path.exists(self.headlines_path) and not self.overwrite:
+                headline_parts.append(pd.read_parquet(self.headlines_path))
+            elif self.overwrite and os.path.exists(self.headlines_path):
+                os.remove(self.headlines_path)
+
         for asof_date in monthly_dates:
             me = month_end(asof_date)
             month_rows = []
+            month_headlines = []
             for t in tickers:
                 key = (me, t)
                 if key in done:
@@ -55,7 +78,8 @@ class MonthlySentimentStore:
                     cache_key,
                     fetch_fn=lambda: self.rss.fetch(query=query, max_items=self.max_items),
                 )
-                titles = [h.get("title", "") for h in headlines if h.get("title")]
+                items = [h for h in headlines if h.get("title")]
+                titles = [h["title"] for h in items]
 
                 if not titles:
                     s = 0.0
@@ -67,11 +91,22 @@ class MonthlySentimentStore:
                     scores = np.concatenate(parts) if parts else np.array([])
                     s = float(np.mean(scores)) if len(scores) else 0.0
                     n = int(len(titles))
+                    if keep_headlines:
+                        month_headlines.append(headline_frame(t, me, items, scores))
 
                 month_rows.append({"month_end": me, "ticker": t, "sentiment_mean": s, "n_headlines": n})
                 done.add(key)
 
             if month_rows:
+                if month_headlines:
+                    new = pd.concat(month_headlines, ignore_index=True)
+                    # a resume can refetch ticker-months whose headlines were stored before the
+                    # monthly parquet was written; the fresh rows replace the stale ones
+                    old = pd.concat(headline_parts, ignore_index=True) if headline_parts else new.iloc[:0]
+                    old = old[~_pair_index(old).isin(_pair_index(new))]
+                    table = sort_headlines(pd.concat([old, new], ignore_index=True)[HEADLINE_COLUMNS])
+                    table.to_parquet(self.headlines_path, index=False)
+                    headline_parts = [table]
                 rows.extend(month_rows)
                 pd.DataFrame(rows).to_parquet(self.parquet_path, index=False)
 
@@ -79,8 +114,4 @@ class MonthlySentimentStore:
 
     @staticmethod
     def load_lookup(parquet_path: str) -> pd.DataFrame:
-        df = pd.read_parquet(parquet_path).copy()
-        df["month_end"] = pd.to_datetime(df["month_end"])
-        df["ticker"] = df["ticker"].astype(str)
-        df["sent_z"] = df.groupby("month_end")["sentiment_mean"].transform(zscore)
-        return df.set_index(["month_end", "ticker"]).sort_index()
+        return to_lookup(pd.read_parquet(parquet_path))
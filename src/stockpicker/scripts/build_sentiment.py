@@ -14,6 +14,7 @@ def main():
     p.add_argument("--start", default="2016-01-01")
     p.add_argument("--bt-start", default="2017-01-31")
     p.add_argument("--parquet", default="sentiment_monthly.parquet")
+    p.add_argument("--headlines-parquet", default="sentiment_headlines.parquet", help="Per-headline scores for re-aggregation.")
     p.add_argument("--max-items", type=int, default=30)
     p.add_argument("--overwrite", action="store_true")
     args = p.parse_args()
@@ -26,6 +27,7 @@ def main():
 
     store = MonthlySentimentStore(
         parquet_path=args.parquet,
+        headlines_path=args.headlines_parquet,
         max_items=args.max_items,
         overwrite=args.overwrite,
     )
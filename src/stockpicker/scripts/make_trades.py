@@ -5,9 +5,10 @@ import pandas as pd
 
 from stockpicker.data.universe import build_universe
 from stockpicker.data.prices import download_adj_close, filter_downloaded_universe
-from stockpicker.features.technical import compute_features, build_monthly_dates
+from stockpicker.features.factors import compute_factors
+from stockpicker.features.technical import build_monthly_dates
 from stockpicker.nlp.sentiment_store import MonthlySentimentStore
-from stockpicker.models.scoring import ScoringContext, score_universe
+from stockpicker.models.scoring import ScoringContext, score_factors
 from stockpicker.portfolio.weights import make_equal_weights, make_inv_vol_weights
 from stockpicker.portfolio.trades import make_trade_blotter
 
@@ -28,7 +29,6 @@ def main():
     tickers, t2s = build_universe()
     adj = download_adj_close(tickers, start=args.start, end=None)
     tickers, t2s = filter_downloaded_universe(adj, tickers, t2s)
-    feats = compute_features(adj)
 
     sent_lookup = None
     if args.lambda_sent != 0.0:
@@ -38,8 +38,9 @@ def main():
 
     monthly = build_monthly_dates(adj.index, start=args.bt_start)
     asof = pd.Timestamp(monthly.iloc[-1])
+    feats = compute_factors(adj, ctx.spec.factors + ["vol_3m"], dates=[asof])
 
-    picks = score_universe(asof, feats["mom_3m"], feats["mom_6m"], feats["vol_3m"], ctx, top_n=args.top_n, lambda_sent=args.lambda_sent)
+    picks = score_factors(asof, feats, ctx, top_n=args.top_n, lambda_sent=args.lambda_sent)
 
     if args.weighting == "equal":
         target_w = make_equal_weights(picks)
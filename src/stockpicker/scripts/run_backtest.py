@@ -5,11 +5,14 @@ import pandas as pd
 
 from stockpicker.data.universe import build_universe
 from stockpicker.data.prices import download_adj_close, filter_downloaded_universe
-from stockpicker.features.technical import compute_features
+from stockpicker.features.factors import compute_factors
+from stockpicker.features.technical import build_monthly_dates
+from stockpicker.nlp.headlines import AGGS, aggregate_headlines, load_headlines
 from stockpicker.nlp.sentiment_store import MonthlySentimentStore
 from stockpicker.models.scoring import ScoringContext
 from stockpicker.backtest.engine import BacktestConfig, run_monthly_backtest
 from stockpicker.backtest.metrics import perf_stats_from_equity
+from stockpicker.backtest.cache import BacktestResultCache
 
 
 def main():
@@ -23,21 +26,39 @@ def main():
     p.add_argument("--lambda-sent", type=float, default=0.0, help="Sentiment weight (0 disables).")
     p.add_argument("--sent-parquet", default="sentiment_monthly.parquet")
     p.add_argument("--build-sent", action="store_true", help="Build sentiment parquet before backtest (slow).")
+    p.add_argument("--sent-headlines", default="sentiment_headlines.parquet")
+    p.add_argument("--sent-agg", choices=AGGS, default=None,
+                   help="Re-aggregate stored headline scores instead of using the monthly parquet.")
+    p.add_argument("--sent-window-days", type=float, default=30.0,
+                   help="Point-in-time window by publish date for --sent-agg (<= 0 uses fetch months).")
+    p.add_argument("--cache-dir", default="bt_cache", help="Directory for memoized backtest results.")
+    p.add_argument("--no-cache", action="store_true", help="Always re-run the simulation.")
     args = p.parse_args()
 
     tickers, t2s = build_universe()
     adj = download_adj_close(tickers, start=args.start, end=None)
     tickers, t2s = filter_downloaded_universe(adj, tickers, t2s)
-    feats = compute_features(adj)
+    # the engine only reads factors on rebalance dates, so skip the other trading days
+    rebal_dates = build_monthly_dates(adj.index, start=args.bt_start)
+    feats = compute_factors(adj, ["mom_3m", "mom_6m", "vol_3m"], dates=rebal_dates)
 
     sent_lookup = None
     if args.lambda_sent != 0.0:
         if args.build_sent:
             monthly_dates = pd.Series(adj.index).groupby(adj.index.to_period("M")).last()
             monthly_dates = monthly_dates[monthly_dates >= pd.Timestamp(args.bt_start)]
-            store = MonthlySentimentStore(parquet_path=args.sent_parquet, overwrite=False)
+            store = MonthlySentimentStore(parquet_path=args.sent_parquet, headlines_path=args.sent_headlines, overwrite=False)
             store.build_resumable(tickers=tickers, monthly_dates=monthly_dates)
-        sent_lookup = MonthlySentimentStore.load_lookup(args.sent_parquet)
+        if args.sent_agg is None:
+            sent_lookup = MonthlySentimentStore.load_lookup(args.sent_parquet)
+        else:
+            sent_lookup = aggregate_headlines(
+                load_headlines(args.sent_headlines),
+                asof_dates=rebal_dates,
+                agg=args.sent_agg,
+                window_days=args.sent_window_days if args.sent_window_days > 0 else None,
+                tickers=tickers,
+            )
 
     ctx = ScoringContext(ticker_to_sector=t2s, sent_lookup=sent_lookup)
     cfg = BacktestConfig(
@@ -49,7 +70,11 @@ def main():
         lambda_sent=args.lambda_sent,
     )
 
-    bt = run_monthly_backtest(
+    cache = None if args.no_cache else BacktestResultCache(cache_dir=args.cache_dir)
+    run_fn = run_monthly_backtest if cache is None else cache.run_monthly_backtest
+    stats_fn = perf_stats_from_equity if cache is None else cache.perf_stats_from_equity
+
+    bt = run_fn(
         adj_close=adj,
         mom_3m=feats["mom_3m"],
         mom_6m=feats["mom_6m"],
@@ -63,7 +88,7 @@ def main():
         print("Backtest returned empty results (check dates / data coverage).")
         return
 
-    stats = perf_stats_from_equity(bt["equity_norm"])
+    stats = stats_fn(bt["equity_norm"])
     print("Perf stats:", stats)
     out_csv = "backtest_results.csv"
     bt.to_csv(out_csv)
@@ -0,0 +1,23 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+sys.path.insert(0, str(SRC))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def panel():
+    """Synthetic adj_close for 12 tickers over 2016-2018 (one NaN gap), plus a 2-sector map."""
+    rng = np.random.default_rng(1)
+    idx = pd.bdate_range("2016-01-01", "2018-12-31")
+    tickers = [f"T{i}" for i in range(12)]
+    rets = rng.normal(0.0005, 0.01, size=(len(idx), len(tickers)))
+    adj = pd.DataFrame(100 * np.exp(np.cumsum(rets, axis=0)), index=idx, columns=tickers)
+    adj.iloc[300:310, 3] = np.nan
+    t2s = {t: ("A" if i % 2 else "B") for i, t in enumerate(tickers)}
+    return adj, t2s
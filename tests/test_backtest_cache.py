@@ -0,0 +1,97 @@
+import os
+import sys
+import threading
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+sys.path.insert(0, str(SRC))
+
+import numpy as np
+import pandas as pd
+from stockpicker.backtest.cache import BacktestResultCache, backtest_cache_key
+from stockpicker.backtest.engine import BacktestConfig, run_monthly_backtest
+from stockpicker.features.technical import compute_features
+from stockpicker.models.scoring import ScoringContext
+
+
+
+def test_cache_hit_matches_fresh_run(tmp_path, panel):
+    adj, t2s = panel
+    feats = compute_features(adj)
+    ctx = ScoringContext(ticker_to_sector=t2s)
+    cfg = BacktestConfig(top_n=5, start="2016-09-30")
+    args = (adj, feats["mom_3m"], feats["mom_6m"], feats["vol_3m"], ctx, cfg)
+
+    cache = BacktestResultCache(cache_dir=str(tmp_path))
+    first = cache.run_monthly_backtest(*args)
+    second = cache.run_monthly_backtest(*args)
+    pd.testing.assert_frame_equal(first, run_monthly_backtest(*args), check_freq=False)
+    pd.testing.assert_frame_equal(first, second, check_freq=False)
+    assert cache.perf_stats_from_equity(first["equity_norm"]) == cache.perf_stats_from_equity(first["equity_norm"])
+
+    other = BacktestConfig(top_n=6, start="2016-09-30")
+    assert backtest_cache_key(*args) != backtest_cache_key(*args[:-1], other)
+    bumped = adj.copy()
+    bumped.iloc[-1, 0] *= 1.01
+    assert backtest_cache_key(*args) != backtest_cache_key(bumped, *args[1:])
+
+
+def test_cache_key_tracks_sent_lookup_when_enabled(panel):
+    adj, t2s = panel
+    feats = compute_features(adj)
+    me = pd.Timestamp("2017-01-31")
+    idx = pd.MultiIndex.from_product([[me], list(t2s)], names=["month_end", "ticker"])
+    lookup_a = pd.DataFrame({"sent_z": np.linspace(-1, 1, len(idx))}, index=idx)
+    lookup_b = lookup_a.assign(sent_z=-lookup_a["sent_z"])
+    panels = (adj, feats["mom_3m"], feats["mom_6m"], feats["vol_3m"])
+
+    on = BacktestConfig(top_n=5, lambda_sent=0.25)
+    key_a = backtest_cache_key(*panels, ScoringContext(t2s, sent_lookup=lookup_a), on)
+    key_b = backtest_cache_key(*panels, ScoringContext(t2s, sent_lookup=lookup_b), on)
+    assert key_a != key_b
+
+    off = BacktestConfig(top_n=5, lambda_sent=0.0)
+    assert backtest_cache_key(*panels, ScoringContext(t2s, sent_lookup=lookup_a), off) == \
+        backtest_cache_key(*panels, ScoringContext(t2s, sent_lookup=lookup_b), off)
+
+
+def test_cache_evicts_to_size(tmp_path):
+    cache = BacktestResultCache(cache_dir=str(tmp_path), max_bytes=1)
+    cache.perf_stats_from_equity(pd.Series([1.0, 1.1, 1.2]))
+    cache.perf_stats_from_equity(pd.Series([1.0, 0.9, 1.3]))
+    assert not any(tmp_path.glob("*.parquet"))
+
+
+def test_cache_cleans_stale_tmp_files(tmp_path):
+    stale = tmp_path / "bt_deadbeef.parquet.tmp"
+    stale.write_bytes(b"x" * 64)
+    old = os.path.getmtime(stale) - 2 * 3600
+    os.utime(stale, (old, old))
+    cache = BacktestResultCache(cache_dir=str(tmp_path))
+    cache.perf_stats_from_equity(pd.Series([1.0, 1.1, 1.2]))
+    assert not stale.exists()
+
+
+def test_concurrent_writes_of_one_key(tmp_path):
+    cache = BacktestResultCache(cache_dir=str(tmp_path))
+    path = cache._path("bt", "samekey")
+    df = pd.DataFrame({"equity": np.linspace(1.0, 2.0, 50)})
+    errors = []
+
+    def writer():
+        try:
+            for _ in range(5):
+                cache._write(path, df)
+        except Exception as e:  # pragma: no cover - failure path
+            errors.append(e)
+
+    threads = [threading.Thread(target=writer) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    pd.testing.assert_frame_equal(cache._read(path), df)
+    assert not any(tmp_path.glob("*.tmp"))
@@ -0,0 +1,77 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+sys.path.insert(0, str(SRC))
+
+import numpy as np
+import pandas as pd
+import pytest
+from stockpicker.backtest.engine import BacktestConfig, run_monthly_backtest
+from stockpicker.features.factors import FACTORS, compute_factors
+from stockpicker.features.technical import build_monthly_dates, compute_features
+from stockpicker.models.scoring import FactorTerm, ScoringContext, ScoringSpec
+
+
+
+def test_compute_features_matches_direct_pandas(panel):
+    adj, _ = panel
+    feats = compute_features(adj)
+    rets = adj.pct_change(fill_method=None)
+    pd.testing.assert_frame_equal(feats["rets"], rets)
+    pd.testing.assert_frame_equal(feats["mom_3m"], adj.pct_change(63, fill_method=None))
+    pd.testing.assert_frame_equal(feats["mom_6m"], adj.pct_change(126, fill_method=None))
+    pd.testing.assert_frame_equal(feats["vol_3m"], rets.rolling(63).std())
+    assert "rets" not in FACTORS
+
+
+def test_window_stats_recover_after_zero_price(panel):
+    adj, _ = panel
+    adj = adj.copy()
+    adj.iloc[400, 5] = 0.0  # next day's return is inf
+    raw = adj.pct_change(fill_method=None)
+    assert np.isinf(raw.iloc[401, 5])
+
+    feats = compute_features(adj)
+    expected = raw.rolling(63).std()
+    pd.testing.assert_frame_equal(feats["vol_3m"], expected)
+    assert feats["vol_3m"].iloc[401 + 63:, 5].notna().all()
+
+    rets = raw.replace([np.inf, -np.inf], np.nan)
+    expected_down = np.sqrt((rets.clip(upper=0.0) ** 2).rolling(63).mean())
+    pd.testing.assert_frame_equal(compute_factors(adj, ["downside_vol_3m"])["downside_vol_3m"], expected_down)
+
+
+def test_downside_vol_matches_rolling_semideviation(panel):
+    adj, _ = panel
+    rets = adj.pct_change(fill_method=None)
+    expected = np.sqrt((rets.clip(upper=0.0) ** 2).rolling(63).mean())
+    pd.testing.assert_frame_equal(compute_factors(adj, ["downside_vol_3m"])["downside_vol_3m"], expected)
+
+
+def test_rebalance_dates_match_daily_panels(panel):
+    adj, _ = panel
+    dates = build_monthly_dates(adj.index, start="2016-02-29")
+    names = list(FACTORS)
+    daily = compute_factors(adj, names)
+    sparse = compute_factors(adj, names, dates=dates)
+    for n in names:
+        expected = daily[n].loc[pd.DatetimeIndex(dates)]
+        pd.testing.assert_frame_equal(sparse[n], expected, check_freq=False, check_names=False, rtol=1e-9)
+
+
+def test_backtest_with_extra_factor_spec(panel):
+    adj, t2s = panel
+    feats = compute_features(adj)
+    spec = ScoringSpec(terms=(FactorTerm("mom_12_1", 1.0, sector_relative=True), FactorTerm("downside_vol_3m", -0.5)))
+    ctx = ScoringContext(ticker_to_sector=t2s, spec=spec)
+    cfg = BacktestConfig(top_n=5, start="2017-01-31")
+    bt = run_monthly_backtest(adj, feats["mom_3m"], feats["mom_6m"], feats["vol_3m"], ctx, cfg)
+    assert len(bt) > 10
+    assert np.isfinite(bt["equity"]).all()
+
+
+def test_empty_spec_rejected():
+    with pytest.raises(ValueError):
+        ScoringSpec(terms=())
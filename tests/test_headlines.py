@@ -0,0 +1,138 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+sys.path.insert(0, str(SRC))
+
+import numpy as np
+import pandas as pd
+from stockpicker.nlp.headlines import AGGS, aggregate_headlines, headline_frame, load_headlines, sort_headlines
+
+
+def _table(tmp_path):
+    parts = [
+        headline_frame("AAA", pd.Timestamp("2020-01-31"), [
+            {"title": "AAA beats", "published": "Tue, 28 Jan 2020 14:00:00 GMT"},
+            {"title": "AAA upgraded", "published": "Mon, 03 Feb 2020 09:00:00 GMT"},  # after the cutoff
+        ], np.array([0.8, 0.6])),
+        headline_frame("BBB", pd.Timestamp("2020-01-31"), [
+            {"title": "BBB misses", "published": "Fri, 10 Jan 2020 21:00:00 GMT"},
+        ], np.array([-0.5])),
+    ]
+    path = tmp_path / "headlines.parquet"
+    sort_headlines(pd.concat(parts, ignore_index=True)).to_parquet(path, index=False)
+    return load_headlines(str(path))
+
+
+def test_fetch_month_mean_matches_monthly_build(tmp_path):
+    lookup = aggregate_headlines(_table(tmp_path), window_days=None)
+    me = pd.Timestamp("2020-01-31")
+    assert np.isclose(lookup.loc[(me, "AAA"), "sentiment_mean"], 0.7)
+    assert lookup.loc[(me, "AAA"), "n_headlines"] == 2
+    assert np.isclose(lookup.loc[(me, "BBB"), "sentiment_mean"], -0.5)
+    assert list(lookup.columns) == ["sentiment_mean", "n_headlines", "sent_z"]
+
+
+def test_window_is_point_in_time(tmp_path):
+    table = _table(tmp_path)
+    asof = [pd.Timestamp("2020-01-31")]
+    lookup = aggregate_headlines(table, asof, agg="mean", window_days=30, tickers=["AAA", "BBB", "CCC"])
+    me = pd.Timestamp("2020-01-31")
+    assert np.isclose(lookup.loc[(me, "AAA"), "sentiment_mean"], 0.8)
+    assert lookup.loc[(me, "AAA"), "n_headlines"] == 1
+    assert lookup.loc[(me, "CCC"), "n_headlines"] == 0
+    short = aggregate_headlines(table, asof, window_days=7)
+    assert short.loc[(me, "BBB"), "n_headlines"] == 0
+    for agg in AGGS:
+        out = aggregate_headlines(table, asof, agg=agg, window_days=30)
+        assert np.isfinite(out["sent_z"]).all()
+
+
+class _FakeRSS:
+    """Serves the same live headlines for every month, like the real '{t} stock' query."""
+    FEED = {
+        "AAA": [
+            {"title": "AAA beats", "published": "Tue, 14 Jan 2020 14:00:00 GMT"},
+            {"title": "AAA upgraded", "published": "Mon, 20 Jan 2020 09:00:00 GMT"},
+        ],
+        "BBB": [{"title": "BBB misses", "published": "Fri, 10 Jan 2020 21:00:00 GMT"}],
+        "CCC": [],
+    }
+
+    def get_cached(self, key, fetch_fn):
+        return fetch_fn()
+
+    def fetch(self, query, max_items=30):
+        return self.FEED[query.split()[0]][:max_items]
+
+
+class _FakeFinBert:
+    SCORES = {"AAA beats": 0.5, "AAA upgraded": 0.1, "BBB misses": -0.4}
+
+    def score_batch(self, texts, max_length=64):
+        return np.array([self.SCORES[t] for t in texts])
+
+
+def _build(tmp_path):
+    from stockpicker.nlp.sentiment_store import MonthlySentimentStore
+    store = MonthlySentimentStore(
+        parquet_path=str(tmp_path / "monthly.parquet"),
+        headlines_path=str(tmp_path / "headlines.parquet"),
+        rss=_FakeRSS(),
+        finbert=_FakeFinBert(),
+    )
+    months = pd.Series(pd.to_datetime(["2020-01-31", "2020-02-28", "2020-03-31"]))
+    store.build_resumable(tickers=["AAA", "BBB", "CCC"], monthly_dates=months)
+    return store, months
+
+
+def test_build_keeps_headlines_matching_monthly_lookup(tmp_path):
+    from stockpicker.nlp.sentiment_store import MonthlySentimentStore
+    store, _ = _build(tmp_path)
+    monthly = MonthlySentimentStore.load_lookup(store.parquet_path)
+    table = load_headlines(store.headlines_path)
+    assert len(table) == 3 * 3  # three headlines under each of three fetch months
+
+    rebuilt = aggregate_headlines(table, window_days=None, tickers=["AAA", "BBB", "CCC"])
+    assert rebuilt.index.equals(monthly.index)
+    assert (rebuilt["n_headlines"] == monthly["n_headlines"]).all()
+    assert np.allclose(rebuilt["sentiment_mean"], monthly["sentiment_mean"], atol=1e-6)
+    assert np.allclose(rebuilt["sent_z"], monthly["sent_z"], atol=1e-5)
+
+
+def test_resume_does_not_duplicate_headlines(tmp_path):
+    store, months = _build(tmp_path)
+    n_rows = len(pd.read_parquet(store.headlines_path))
+    # crash after the headline write but before the monthly write: those months get refetched
+    Path(store.parquet_path).unlink()
+    store.build_resumable(tickers=["AAA", "BBB", "CCC"], monthly_dates=months)
+    assert len(pd.read_parquet(store.headlines_path)) == n_rows
+
+
+def test_window_counts_refetched_headlines_once(tmp_path):
+    store, _ = _build(tmp_path)
+    table = load_headlines(store.headlines_path)
+    me = pd.Timestamp("2020-01-31")
+    lookup = aggregate_headlines(table, [me], agg="count_weighted", window_days=30, prior_count=5.0)
+    assert lookup.loc[(me, "AAA"), "n_headlines"] == 2
+    assert np.isclose(lookup.loc[(me, "AAA"), "sentiment_mean"], 0.6 / 7, atol=1e-6)
+
+
+def test_undated_headlines_rank_oldest(tmp_path):
+    me = pd.Timestamp("2020-01-31")
+    rows = headline_frame("AAA", me, [
+        {"title": "AAA dips", "published": "Mon, 06 Jan 2020 10:00:00 GMT"},
+        {"title": "AAA rallies", "published": "Thu, 30 Jan 2020 10:00:00 GMT"},
+        {"title": "AAA undated", "published": "not a date"},
+    ], np.array([0.1, 0.9, -1.0]))
+    path = tmp_path / "headlines.parquet"
+    sort_headlines(rows).to_parquet(path, index=False)
+    table = load_headlines(str(path))
+
+    last = aggregate_headlines(table, window_days=None, agg="last_n", last_n=1)
+    assert np.isclose(last.loc[(me, "AAA"), "sentiment_mean"], 0.9)
+    assert last.loc[(me, "AAA"), "n_headlines"] == 3
+
+    decay = aggregate_headlines(table, window_days=None, agg="decay")
+    assert 0.1 < decay.loc[(me, "AAA"), "sentiment_mean"] < 0.9